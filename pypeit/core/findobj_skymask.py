@@ -4,13 +4,17 @@
 
 """
 import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import scipy.interpolate
 import scipy.ndimage
+import scipy.signal
 import matplotlib.pyplot as plt
 
 import astropy.stats
+from sklearn import cluster
 
 from pypeit import msgs
 from pypeit import utils
@@ -25,12 +29,11 @@ from pypeit.core import arc
 from pypeit.display import display
 from pypeit.core import pixels
 from pypeit.core import extract
-from pypeit.utils import fast_running_median
 from IPython import embed
 
 
 def create_skymask(sobjs, thismask, slit_left, slit_righ, box_rad_pix=None, trim_edg=(5,5),
-                   skymask_snr_thresh=1.0):
+                   skymask_snr_thresh=1.0, ximg=None):
     r"""
     Creates a sky mask from a :class:`~pypeit.specobjs.SpecObjs` using the fwhm
     of each object and/or the boxcar radius.
@@ -59,6 +62,12 @@ def create_skymask(sobjs, thismask, slit_left, slit_righ, box_rad_pix=None, trim
             create the sky mask via a Gaussian model of the SNR profile.  The
             (spatial) Gaussian model is determined from the image after
             collapsing along the spectral dimension.
+        ximg (`numpy.ndarray`_, optional):
+            Fractional position of each pixel along the slit, as computed by
+            :func:`~pypeit.core.pixels.ximg_and_edgemask` using the same
+            ``trim_edg``.  Shape must match ``thismask``.  If None, it is
+            computed here.  Callers that invoke this routine repeatedly on the
+            same slit/order can pass it in to avoid recomputing it per call.
 
     Returns:
         `numpy.ndarray`_: Boolean image with shape :math:`(N_{\rm spec}, N_{\rm
@@ -67,56 +76,108 @@ def create_skymask(sobjs, thismask, slit_left, slit_righ, box_rad_pix=None, trim
         subtraction, False means it should be masked when subtracting sky).
     """
     nobj = len(sobjs)
-    ximg, _ = pixels.ximg_and_edgemask(slit_left, slit_righ, thismask, trim_edg=trim_edg)
+    if ximg is None:
+        ximg, _ = pixels.ximg_and_edgemask(slit_left, slit_righ, thismask, trim_edg=trim_edg)
     # How many pixels wide is the slit at each Y?
     xsize = slit_righ - slit_left
     #nsamp = np.ceil(np.median(xsize)) # JFH Changed 07-07-19
     nsamp = np.ceil(xsize.max())
 
+    # Gather the per-object quantities into contiguous arrays up front
+    # (struct-of-arrays); the mask construction below then reads NumPy buffers
+    # instead of chasing SpecObj attribute lookups per object.  Undefined
+    # smash_snr values (e.g. mask-design objects) map to 0 so they are skipped
+    # by the SNR-profile masking, as before.
+    if nobj > 0:
+        trace_spat_all = np.stack([sobjs[iobj].TRACE_SPAT for iobj in range(nobj)])
+        fwhm_all = sobjs.FWHM
+        fracpos_all = sobjs.SPAT_FRACPOS
+        maskwidth_all = sobjs.maskwidth
+        snr_all = np.array([0. if sobjs[iobj].smash_snr is None else sobjs[iobj].smash_snr
+                            for iobj in range(nobj)])
+
+    # Only the on-slit subset of the mask is returned, so the component masks
+    # and the boolean algebra combining them are kept as 1-d vectors over the
+    # slit pixels rather than full-image temporaries.
+    npix = np.sum(thismask)
     # Objmask
-    skymask_objsnr = np.copy(thismask)
+    skymask_objsnr = np.ones(npix, dtype=bool)
     if nobj == 0:
         msgs.info('No objects were detected. The entire slit will be used to determine the sky subtraction.')
     else:
         # Compute some inputs for the object mask
         xtmp = (np.arange(nsamp) + 0.5)/nsamp
-        # threshold for object finding
-        for iobj in range(nobj):
-            # this will skip also sobjs with THRESHOLD=0, because are the same that have smash_snr=0.
-            if (sobjs[iobj].smash_snr != 0.) and (sobjs[iobj].smash_snr != None):
-                qobj = np.zeros_like(xtmp)
-                sep = np.abs(xtmp-sobjs[iobj].SPAT_FRACPOS)
-                sep_inc = sobjs[iobj].maskwidth/nsamp
-                close = sep <= sep_inc
-                # This is an analytical SNR profile with a Gaussian shape.
-                # JFH modified to use SNR here instead of smash peakflux. I believe that the 2.77 is supposed to be
-                # 2.355**2/2, i.e. the argument of a gaussian with sigma = FWHM/2.35
-                qobj[close] = sobjs[iobj].smash_snr * \
-                               np.exp(np.fmax(-2.77*(sep[close]*nsamp)**2/sobjs[iobj].FWHM**2, -9.0))
-                skymask_objsnr[thismask] &= np.interp(ximg[thismask], xtmp, qobj) < skymask_snr_thresh
+        # Fractional position of each pixel on the slit, computed once and
+        # shared by all objects
+        ximg_slit = ximg[thismask]
+        # Since xtmp is a uniform grid, interpolating the object profiles onto
+        # the slit pixels reduces to an index computation plus a weighted sum
+        # of the two bracketing samples.  Precompute the indices and weights
+        # once here and share them across all the objects rather than
+        # re-searching the grid with np.interp per object.  The clipping of the
+        # weights reproduces the endpoint behavior of np.interp.
+        xeval = ximg_slit*nsamp - 0.5
+        indx_lo = np.clip(np.floor(xeval).astype(int), 0, int(nsamp)-2)
+        wgt = np.clip(xeval - indx_lo, 0.0, 1.0)
+        # Evaluate the profiles of all the valid objects on the shared xtmp
+        # grid in one broadcast pass; this will skip sobjs with THRESHOLD=0,
+        # because they are the same that have smash_snr=0.
+        valid = snr_all != 0.
+        if np.any(valid):
+            sep = np.abs(xtmp[None,:] - fracpos_all[valid,None])
+            close = sep <= maskwidth_all[valid,None]/nsamp
+            # This is an analytical SNR profile with a Gaussian shape.
+            # JFH modified to use SNR here instead of smash peakflux. I believe that the 2.77 is supposed to be
+            # 2.355**2/2, i.e. the argument of a gaussian with sigma = FWHM/2.35
+            # The scale/square/clip/exp chain is evaluated in place on a single
+            # (nobj, nsamp) buffer so that only one temporary of that shape is
+            # ever allocated.
+            qobj_arr = sep*nsamp
+            np.square(qobj_arr, out=qobj_arr)
+            qobj_arr *= -2.77
+            qobj_arr /= fwhm_all[valid,None]**2
+            np.fmax(qobj_arr, -9.0, out=qobj_arr)
+            np.exp(qobj_arr, out=qobj_arr)
+            qobj_arr *= snr_all[valid,None]
+            qobj_arr[np.logical_not(close)] = 0.
+            qobj_slit = qobj_arr[:,indx_lo]*(1.0-wgt) + qobj_arr[:,indx_lo+1]*wgt
+            skymask_objsnr = np.all(qobj_slit < skymask_snr_thresh, axis=0)
     # FWHM
-    skymask_fwhm = np.copy(thismask)
+    skymask_fwhm = np.ones(npix, dtype=bool)
     if nobj > 0:
         nspec, nspat = thismask.shape
-        # spatial position everywhere along image
-        spat_img = np.outer(np.ones(nspec, dtype=int),np.arange(nspat, dtype=int))
+        # spatial position along a row of the image; this broadcasts against
+        # the object traces below without tiling a full (nspec, nspat) image.
+        # Detector coordinates are far below the single-precision limit, so
+        # the distance compare is done in float32 to halve the bandwidth of
+        # the (nobj, nspec, nspat) temporary.
+        spat_vec = np.arange(nspat, dtype=np.float32)
+        trace_spat_f32 = trace_spat_all.astype(np.float32)
         # Boxcar radius?
         if box_rad_pix is not None:
             msgs.info("Using boxcar radius for masking")
-        # Loop me
+        # The stacked traces and masking radii allow the per-object masks to be
+        # built with a single broadcast comparison rather than a Python loop
+        # over full-image temporaries
+        radii = (np.full(nobj, box_rad_pix) if box_rad_pix is not None
+                    else fwhm_all).astype(np.float32)
         for iobj in range(nobj):
-            # Create a mask for the pixels that will contribute to the object
-            skymask_radius = box_rad_pix if box_rad_pix is not None else sobjs[iobj].FWHM
-            msgs.info(f"Masking around object {iobj+1} within a radius = {skymask_radius} pixels")
-            slit_img = np.outer(sobjs[iobj].TRACE_SPAT, np.ones(nspat))  # central trace replicated spatially
-            objmask_now = thismask & (spat_img > (slit_img - skymask_radius)) & (spat_img < (slit_img + skymask_radius))
-            skymask_fwhm &= np.invert(objmask_now)
+            msgs.info(f"Masking around object {iobj+1} within a radius = {radii[iobj]} pixels")
+        # Union of the per-object masks, accumulated over chunks of objects to
+        # bound the size of the (nobj, nspec, nspat) temporary
+        objmask_any = np.zeros_like(thismask)
+        nchunk = 16
+        for i in range(0, nobj, nchunk):
+            objmask_any |= np.any(np.abs(spat_vec[None,None,:] - trace_spat_f32[i:i+nchunk,:,None])
+                                      < radii[i:i+nchunk,None,None], axis=0)
+        # Restrict to the on-slit pixels and negate in 1-d
+        skymask_fwhm = np.logical_not(objmask_any[thismask])
 
         # Check that we have not performed too much masking
-        if (np.sum(skymask_fwhm)/np.sum(thismask) < 0.10):
+        if (np.sum(skymask_fwhm)/npix < 0.10):
             msgs.warn('More than 90% of  usable area on this slit would be masked and not used by global sky subtraction. '
                       'Something is probably wrong with object finding for this slit. Not masking object for global sky subtraction.')
-            skymask_fwhm = np.copy(thismask)
+            skymask_fwhm = np.ones(npix, dtype=bool)
 
     # Still have to make the skymask
     # # TODO -- Make sure this is right
@@ -135,17 +196,14 @@ def create_skymask(sobjs, thismask, slit_left, slit_righ, box_rad_pix=None, trim
     # computation from objs_in_slit is not necessarily that reliable and when large amounts of masking are performed
     # on narrow slits/orders, we have problems. We should revisit this after object finding is refactored since
     # maybe then the fwhm estimates will be more robust.
-    if box_rad_pix is None and np.all([sobj.smash_snr is not None for sobj in sobjs]) \
-            and np.all([sobj.smash_snr != 0. for sobj in sobjs]) and not np.all(skymask_objsnr == thismask):
+    if box_rad_pix is None and nobj > 0 and np.all(snr_all != 0.) \
+            and not np.all(skymask_objsnr):
         # TODO This is a kludge until we refactor this routine. Basically mask design objects that are not auto-ID
         # always have smash_snr undefined. If there is a hybrid situation of auto-ID and maskdesign, the logic
         # here does not really make sense. Soution would be to compute thershold and smash_snr for all objects.
-        skymask = skymask_objsnr | skymask_fwhm
-    else:  # Enforces boxcar radius masking
-        skymask = skymask_objsnr & skymask_fwhm
-
-    # Return
-    return skymask[thismask]
+        return skymask_objsnr | skymask_fwhm
+    # Enforces boxcar radius masking
+    return skymask_objsnr & skymask_fwhm
 
 
 def ech_findobj_ineach_order(
@@ -290,6 +348,9 @@ def ech_findobj_ineach_order(
     if inmask is None:
         inmask = allmask
 
+    # Per-order boxcar radius in pixels, computed once for all orders
+    boxcar_rad_pix = box_radius/plate_scale_ord
+
     # Loop over orders and find objects
     sobjs = specobjs.SpecObjs()
     for iord, iorder in enumerate(order_vec):
@@ -316,7 +377,7 @@ def ech_findobj_ineach_order(
                 hand_extract_dict=hand_extract_dict,  
                 nperslit=nperorder, extract_maskwidth=extract_maskwidth,
                 snr_thresh=snr_thresh, trim_edg=trim_edg, 
-                boxcar_rad=box_radius/plate_scale_ord[iord],
+                boxcar_rad=boxcar_rad_pix[iord],
                 show_peaks=show_peaks, show_fits=show_single_fits,
                 show_trace=show_single_trace, qa_title=qa_title, specobj_dict=specobj_dict,
                 objfindQA_filename=ech_objfindQA_filename)
@@ -370,18 +431,21 @@ def ech_fof_sobjs(sobjs:specobjs.SpecObjs,
     """
     # Prep
     norders = slit_left.shape[1]
-    slit_width = slit_righ - slit_left
     nfound = len(sobjs)
 
-    #
-    FOF_frac = fof_link/(np.median(np.median(slit_width,axis=0)*plate_scale_ord))
-    # Run the FOF. We use fake coordinates
+    # Run the FOF
     fracpos = sobjs.SPAT_FRACPOS
-    ra_fake = fracpos/1000.0  # Divide all angles by 1000 to make geometry euclidian
-    dec_fake = np.zeros_like(fracpos)
     if nfound>1:
-        inobj_id, multobj_id, firstobj_id, nextobj_id \
-                = pydl.spheregroup(ra_fake, dec_fake, FOF_frac/1000.0)
+        # Linking length converted to fractional slit position using the
+        # median (over orders) of the median slit width; only needed when
+        # there is more than one object to group
+        med_slit_width = np.median(slit_righ - slit_left, axis=0)
+        FOF_frac = fof_link/np.median(med_slit_width*plate_scale_ord)
+        # Friends-of-friends grouping of the 1D fractional positions.  DBSCAN
+        # with min_samples=1 chains together all positions within the linking
+        # length, which is the same grouping the spherical spheregroup code
+        # produced on its fake coordinates, but in O(n log n).
+        inobj_id = cluster.DBSCAN(eps=FOF_frac, min_samples=1).fit_predict(fracpos[:,None])
         # Modify to 1-based indexing
         obj_id_init = inobj_id + 1
     elif nfound==1:
@@ -389,34 +453,41 @@ def ech_fof_sobjs(sobjs:specobjs.SpecObjs,
     else:
         msgs.error('No objects found in ech_fof_sobjs. Should not have called this routine')
 
-    uni_obj_id_init, uni_ind_init = np.unique(obj_id_init, return_index=True)
-
-    # Now loop over the unique objects and check that there is only one object per order. If FOF
-    # grouped > 1 objects on the same order, then this will be popped out as its own unique object
+    # Now check that there is only one object per order. If FOF grouped > 1
+    # objects on the same order, then this will be popped out as its own unique
+    # object.  Bucket the objects by (FOF group, order) with a single stable
+    # sort and only visit the buckets that actually contain duplicates, rather
+    # than re-scanning the object list for every (group, order) pair.
     obj_id = obj_id_init.copy()
-    nobj_init = len(uni_obj_id_init)
-    for iobj in range(nobj_init):
-        for iord in range(norders):
-            on_order = (obj_id_init == uni_obj_id_init[iobj]) & (sobjs.ECH_ORDER == order_vec[iord])
-            if (np.sum(on_order) > 1):
-                msgs.warn('Found multiple objects in a FOF group on order iord={:d}'.format(order_vec[iord]) + msgs.newline() +
-                          'Spawning new objects to maintain a single object per order.')
-                off_order = (obj_id_init == uni_obj_id_init[iobj]) & (sobjs.ECH_ORDER != order_vec[iord])
-                ind = np.where(on_order)[0]
-                if np.any(off_order):
-                    # Keep the closest object to the location of the rest of the group (on other orders)
-                    # as corresponding to this obj_id, and spawn new obj_ids for the others.
-                    frac_mean = np.mean(fracpos[off_order])
-                    min_dist_ind = np.argmin(np.abs(fracpos[ind] - frac_mean))
-                else:
-                    # If there are no other objects with this obj_id to compare to, then we simply have multiple
-                    # objects grouped together on the same order, so just spawn new object IDs for them to maintain
-                    # one obj_id per order
-                    min_dist_ind = 0
-                ind_rest = np.setdiff1d(ind,ind[min_dist_ind])
-                # JFH OLD LINE with bug
-                #obj_id[ind_rest] = (np.arange(len(ind_rest)) + 1) + obj_id_init.max()
-                obj_id[ind_rest] = (np.arange(len(ind_rest)) + 1) + obj_id.max()
+    ech_order = sobjs.ECH_ORDER
+    ord_indx = np.argmax(ech_order[:,None] == order_vec[None,:], axis=1)
+    key = obj_id_init*norders + ord_indx
+    isort = np.argsort(key, kind='stable')
+    bounds = np.flatnonzero(np.diff(key[isort]) != 0)
+    for ind in np.split(isort, bounds+1):
+        if ind.size > 1:
+            this_order = ech_order[ind[0]]
+            msgs.warn('Found multiple objects in a FOF group on order iord={:d}'.format(this_order) + msgs.newline() +
+                      'Spawning new objects to maintain a single object per order.')
+            off_order = (obj_id_init == obj_id_init[ind[0]]) & (ech_order != this_order)
+            if np.any(off_order):
+                # Keep the closest object to the location of the rest of the group (on other orders)
+                # as corresponding to this obj_id, and spawn new obj_ids for the others.
+                frac_mean = np.mean(fracpos[off_order])
+                min_dist_ind = np.argmin(np.abs(fracpos[ind] - frac_mean))
+            else:
+                # If there are no other objects with this obj_id to compare to, then we simply have multiple
+                # objects grouped together on the same order, so just spawn new object IDs for them to maintain
+                # one obj_id per order
+                min_dist_ind = 0
+            # Drop the kept object by position; ind is already sorted and
+            # unique, so this is the setdiff without the O(n log n) sorts
+            keep = np.ones(ind.size, dtype=bool)
+            keep[min_dist_ind] = False
+            ind_rest = ind[keep]
+            # JFH OLD LINE with bug
+            #obj_id[ind_rest] = (np.arange(len(ind_rest)) + 1) + obj_id_init.max()
+            obj_id[ind_rest] = (np.arange(len(ind_rest)) + 1) + obj_id.max()
 
     # Finish
     uni_obj_id, uni_ind = np.unique(obj_id, return_index=True)
@@ -503,8 +574,14 @@ def ech_fill_in_orders(sobjs:specobjs.SpecObjs,
     specmid = nspec // 2
 
     gfrac = np.zeros(nfound)
+    # One stable argsort of the group ids turns every "obj_id ==
+    # uni_obj_id[iobj]" boolean scan here and in the object loop below into a
+    # precomputed, contiguous index slice
+    id_sort = np.argsort(obj_id, kind='stable')
+    id_lo = np.searchsorted(obj_id[id_sort], uni_obj_id)
+    id_hi = np.searchsorted(obj_id[id_sort], uni_obj_id, side='right')
     for jj in range(nobj):
-        this_obj_id = obj_id == uni_obj_id[jj]
+        this_obj_id = id_sort[id_lo[jj]:id_hi[jj]]
         gfrac[this_obj_id] = np.median(fracpos[this_obj_id])
 
     uni_frac = gfrac[uni_ind]
@@ -513,36 +590,46 @@ def ech_fill_in_orders(sobjs:specobjs.SpecObjs,
     isort_frac = uni_frac.argsort()
     uni_obj_id = uni_obj_id[isort_frac]
     uni_frac = uni_frac[isort_frac]
+    id_lo = id_lo[isort_frac]
+    id_hi = id_hi[isort_frac]
 
     sobjs_align = sobjs.copy()
-    # Loop over the orders and assign each specobj a fractional position and a obj_id number
-    for iobj in range(nobj):
-        #for iord in range(norders):
-        for iord in order_vec:
-            on_order = (obj_id == uni_obj_id[iobj]) & (sobjs_align.ECH_ORDER == iord)
-            sobjs_align[on_order].ECH_FRACPOS = uni_frac[iobj]
-            sobjs_align[on_order].ECH_OBJID = uni_obj_id[iobj]
-            sobjs_align[on_order].OBJID = uni_obj_id[iobj]
-            sobjs_align[on_order].ech_frac_was_fit = False
+    # Assign each specobj a fractional position and an obj_id number.  Each
+    # entry of obj_id maps a found object to its FOF group, so the group
+    # quantities can be scattered onto the objects in a single pass instead of
+    # scanning the object list once per (iobj, iord) pair.  Note uni_obj_id is
+    # sorted by fractional position, not by value, hence the argsort
+    # indirection for the searchsorted lookup.
+    uni_sort = np.argsort(uni_obj_id)
+    igroup = uni_sort[np.searchsorted(uni_obj_id[uni_sort], obj_id)]
+    sobjs_align.ECH_FRACPOS = uni_frac[igroup]
+    sobjs_align.ECH_OBJID = uni_obj_id[igroup]
+    sobjs_align.OBJID = uni_obj_id[igroup]
+    sobjs_align.ech_frac_was_fit = np.zeros(nfound, dtype=bool)
 
     # Reset names (just in case)
     sobjs_align.set_names()
     # Now loop over objects and fill in the missing objects and their traces. We will fit the fraction slit position of
     # the good orders where an object was found and use that fit to predict the fractional slit position on the bad orders
     # where no object was found
+    # Loop invariants for the per-object fits below
+    ordermin, ordermax = order_vec.min(), order_vec.max()
     for iobj in range(nobj):
-        # Grab all the members of this obj_id from the object list
-        indx_obj_id = sobjs_align.ECH_OBJID == uni_obj_id[iobj]
-        nthisobj_id = np.sum(indx_obj_id)
+        # Grab all the members of this obj_id from the object list.  Rows
+        # appended to the list below always carry the id of an
+        # already-processed object, so the slices precomputed above stay
+        # exact as the list grows.
+        this_rows = id_sort[id_lo[iobj]:id_hi[iobj]]
+        nthisobj_id = this_rows.size
         # Perform the fit if this objects shows up on more than three orders
         if (nthisobj_id > 3) and (nthisobj_id<norders):
             # JFH This line could also be done with spat_ids, but they are all aligned
             # Find the indices of the orders where this object was found
-            thisorder = sobjs_align[indx_obj_id].ECH_ORDER
-            thisorderindx = [i for i, ord in enumerate(order_vec) if ord in thisorder]
-            #thisorderindx = sobjs_align[indx_obj_id].ECH_ORDERINDX # Old line replaced with the list comprehentsion above.
+            thisorder = sobjs_align[this_rows].ECH_ORDER
+            goodorder = np.in1d(order_vec, thisorder)
+            thisorderindx = np.where(goodorder)[0]
             # Allow for masked orders
-            xcen_good = (sobjs_align[indx_obj_id].TRACE_SPAT).T
+            xcen_good = (sobjs_align[this_rows].TRACE_SPAT).T
             slit_frac_good = (xcen_good-slit_left[:,thisorderindx])/slit_width[:,thisorderindx]
             # Fractional slit position averaged across the spectral direction for each order
             frac_mean_good = np.mean(slit_frac_good, 0)
@@ -553,16 +640,17 @@ def ech_fill_in_orders(sobjs:specobjs.SpecObjs,
                 thisorder, frac_mean_good, 1,
                 function='polynomial', maxiter=20, lower=2, upper=2,
                 use_mad= True, sticky=False,
-                minx = order_vec.min(), maxx=order_vec.max())
-            # Fill
-            goodorder = np.in1d(order_vec, thisorder)
+                minx = ordermin, maxx=ordermax)
+            # Fill.  Evaluate the fit once over all the orders (a single
+            # vectorized polyval) and reuse it for the QA plot below rather
+            # than evaluating twice.
             badorder = np.invert(goodorder)
+            frac_mean_fit = pypeitFit.eval(order_vec)
             frac_mean_new = np.zeros(norders)
-            frac_mean_new[badorder] = pypeitFit.eval(order_vec[badorder])
+            frac_mean_new[badorder] = frac_mean_fit[badorder]
             frac_mean_new[goodorder] = frac_mean_good
             # TODO This QA needs some work
             if show:
-                frac_mean_fit = pypeitFit.eval(order_vec)
                 plt.plot(order_vec[goodorder][pypeitFit.bool_gpm], frac_mean_new[goodorder][pypeitFit.bool_gpm], 'ko', mfc='k', markersize=8.0, label='Good Orders Kept')
                 plt.plot(order_vec[goodorder][np.invert(pypeitFit.bool_gpm)], frac_mean_new[goodorder][np.invert(pypeitFit.bool_gpm)], 'ro', mfc='k', markersize=8.0, label='Good Orders Rejected')
                 plt.plot(order_vec[badorder], frac_mean_new[badorder], 'ko', mfc='None', markersize=8.0, label='Predicted Bad Orders')
@@ -577,59 +665,77 @@ def ech_fill_in_orders(sobjs:specobjs.SpecObjs,
             frac_mean_new = np.full(norders, uni_frac[iobj])
 
 
-        # Now loop over the orders and add objects on the orders for 
+        # Candidate traces of this object on every order, computed in one
+        # vectorized pass; the loop below only instantiates SpecObj for the
+        # orders where the object is missing.
+        trace_new = slit_left + slit_width*frac_mean_new[None,:]
+        if std_trace is not None:
+            # np.interp of each column at the scalar slit_spec_pos reduces to
+            # a weighted pair of rows since spec_vec is a uniform grid
+            ilo = int(np.clip(np.floor(slit_spec_pos), 0, nspec-2))
+            wgt = slit_spec_pos - ilo
+            x_trace = std_trace[ilo,:] + wgt*(std_trace[ilo+1,:] - std_trace[ilo,:])
+            shift = trace_new[ilo,:] + wgt*(trace_new[ilo+1,:] - trace_new[ilo,:]) - x_trace
+            trace_new = std_trace + shift[None,:]
+
+        # Orders on which this object was actually found and the orders it is
+        # missing from, established up front
+        det_orders = np.atleast_1d(sobjs_align[this_rows].ECH_ORDER)
+        num_on_order = np.sum(det_orders[None,:] == order_vec[:,None], axis=1)
+        if np.any(num_on_order > 1):
+            ibad = np.argmax(num_on_order > 1)
+            msgs.error('Problem in echelle object finding. The same objid={:d} appears {:d} times on echelle orderindx ={:d}'
+                       ' even after duplicate obj_ids the orders were removed. '
+                       'Report this bug to PypeIt developers'.format(uni_obj_id[iobj],num_on_order[ibad], ibad))
+        missing = np.where(num_on_order == 0)[0]
+        nmiss = missing.size
+
+        # Nearest populated order for every missing order, computed with a
+        # single masked distance matrix rather than an argmin per order.
+        # Orders filled earlier in the scan are themselves candidates for
+        # later fills, so the candidate list of the k-th missing order is the
+        # real detections plus the first k filled orders.
+        if nmiss > 0:
+            miss_orders = order_vec[missing]
+            cand_orders = np.concatenate([det_orders, miss_orders])
+            dist = np.abs(cand_orders[None,:] - miss_orders[:,None]).astype(float)
+            dist[np.arange(cand_orders.size)[None,:]
+                    >= det_orders.size + np.arange(nmiss)[:,None]] = np.inf
+            imin_arr = np.argmin(dist, axis=1)
+
+        # Now loop over the orders and add objects on the orders for
         #  which the current object was not found
-        for iord, this_order in enumerate(order_vec):
-            # Is the current object detected on this order?
-            on_order = (sobjs_align.ECH_OBJID == uni_obj_id[iobj]) & (sobjs_align.ECH_ORDER == this_order)
-            num_on_order = np.sum(on_order)
-            if num_on_order == 0:
-                msgs.info(f"Adding object={uni_obj_id[iobj]} to order={this_order}")
-                # If it is not, create a new sobjs and add to sobjs_align and assign required tags
-                thisobj = specobj.SpecObj('Echelle', sobjs_align[0].DET,
-                                             OBJTYPE=sobjs_align[0].OBJTYPE,
-                                             ECH_ORDERINDX=iord,
-                                             ECH_ORDER=this_order)
-                #thisobj.ECH_ORDERINDX = iord
-                #thisobj.ech_order = order_vec[iord]
-                thisobj.SPAT_FRACPOS = uni_frac[iobj]
-                # Assign traces using the fractional position fit above
-                if std_trace is not None:
-                    x_trace = np.interp(slit_spec_pos, spec_vec, std_trace[:,iord])
-                    shift = np.interp(
-                        slit_spec_pos, spec_vec, slit_left[:,iord] + 
-                        slit_width[:,iord]*frac_mean_new[iord]) - x_trace
-                    thisobj.TRACE_SPAT = std_trace[:,iord] + shift
-                else:
-                    thisobj.TRACE_SPAT = slit_left[:, iord] + slit_width[:, iord] * frac_mean_new[iord]  # new trace
-                thisobj.trace_spec = spec_vec
-                thisobj.SPAT_PIXPOS = thisobj.TRACE_SPAT[specmid]
-                # Use the real detections of this objects for the FWHM
-                this_obj_id = obj_id == uni_obj_id[iobj]
-                # Assign to the fwhm of the nearest detected order
-                imin = np.argmin(np.abs(sobjs_align[this_obj_id].ECH_ORDER - this_order))
-                thisobj.FWHM = sobjs_align[imin].FWHM
-                thisobj.hand_extract_flag = sobjs_align[imin].hand_extract_flag
-                thisobj.maskwidth = sobjs_align[imin].maskwidth
-                thisobj.smash_peakflux = sobjs_align[imin].smash_peakflux
-                thisobj.smash_snr = sobjs_align[imin].smash_snr
-                thisobj.BOX_RADIUS = sobjs_align[imin].BOX_RADIUS
-                thisobj.ECH_FRACPOS = uni_frac[iobj]
-                thisobj.ECH_OBJID = uni_obj_id[iobj]
-                thisobj.OBJID = uni_obj_id[iobj]
-                thisobj.SLITID = slit_spat_id[iord]
-                thisobj.ech_frac_was_fit = True
-                thisobj.set_name()
-                sobjs_align.add_sobj(thisobj)
-                obj_id = np.append(obj_id, uni_obj_id[iobj])
-                gfrac = np.append(gfrac, uni_frac[iobj])
-            elif num_on_order == 1:
-                # Object is already on this order so no need to do anything
-                pass
-            elif num_on_order > 1:
-                msgs.error('Problem in echelle object finding. The same objid={:d} appears {:d} times on echelle orderindx ={:d}'
-                           ' even after duplicate obj_ids the orders were removed. '
-                           'Report this bug to PypeIt developers'.format(uni_obj_id[iobj],num_on_order, iord))    
+        for k, iord in enumerate(missing):
+            this_order = order_vec[iord]
+            msgs.info(f"Adding object={uni_obj_id[iobj]} to order={this_order}")
+            # Create a new sobjs and add to sobjs_align and assign required tags
+            thisobj = specobj.SpecObj('Echelle', sobjs_align[0].DET,
+                                         OBJTYPE=sobjs_align[0].OBJTYPE,
+                                         ECH_ORDERINDX=iord,
+                                         ECH_ORDER=this_order)
+            #thisobj.ECH_ORDERINDX = iord
+            #thisobj.ech_order = order_vec[iord]
+            thisobj.SPAT_FRACPOS = uni_frac[iobj]
+            # Assign traces using the fractional position fit above
+            thisobj.TRACE_SPAT = trace_new[:,iord]
+            thisobj.trace_spec = spec_vec
+            thisobj.SPAT_PIXPOS = thisobj.TRACE_SPAT[specmid]
+            # Use the real detections of this objects for the FWHM
+            # Assign to the fwhm of the nearest detected order
+            imin = imin_arr[k]
+            thisobj.FWHM = sobjs_align[imin].FWHM
+            thisobj.hand_extract_flag = sobjs_align[imin].hand_extract_flag
+            thisobj.maskwidth = sobjs_align[imin].maskwidth
+            thisobj.smash_peakflux = sobjs_align[imin].smash_peakflux
+            thisobj.smash_snr = sobjs_align[imin].smash_snr
+            thisobj.BOX_RADIUS = sobjs_align[imin].BOX_RADIUS
+            thisobj.ECH_FRACPOS = uni_frac[iobj]
+            thisobj.ECH_OBJID = uni_obj_id[iobj]
+            thisobj.OBJID = uni_obj_id[iobj]
+            thisobj.SLITID = slit_spat_id[iord]
+            thisobj.ech_frac_was_fit = True
+            thisobj.set_name()
+            sobjs_align.add_sobj(thisobj)
     # Return
     return sobjs_align
 
@@ -718,9 +824,9 @@ def ech_cutobj_on_snr(
     # Loop over the objects and perform a quick and dirty extraction to assess S/N.
     varimg = utils.calc_ivar(ivar)
     flux_box = np.zeros((nspec, norders, nobj))
-    ivar_box = np.zeros((nspec, norders, nobj))
+    var_box = np.zeros((nspec, norders, nobj))
     mask_box = np.zeros((nspec, norders, nobj))
-    SNR_arr = np.zeros((norders, nobj))
+    sobjs_arr = np.empty((norders, nobj), dtype=object)
     slitfracpos_arr = np.zeros((norders, nobj))
     hand_flag = np.zeros(nobj, dtype=bool)
 
@@ -729,40 +835,79 @@ def ech_cutobj_on_snr(
         mt_obj = sobjs_align.ECH_OBJID == uni_obj_id[iobj]
         if np.any(sobjs_align[mt_obj].hand_extract_flag):
             hand_flag[iobj] = True
-        # SNR
-        for iord in range(norders):
-            iorder_vec = order_vec[iord]
-            indx = sobjs_align.slitorder_objid_indices(
-                iorder_vec, uni_obj_id[iobj])
-            #indx = (sobjs_align.ECH_OBJID == uni_obj_id[iobj]) & (sobjs_align.ECH_ORDERINDX == iord)
-            #spec = sobjs_align[indx][0]
-            inmask_iord = inmask & (slitmask == sobjs_align[indx].SLITID)# gdslit_spat[iord])
-            # TODO make the snippet below its own function quick_extraction()
-            box_rad_pix = box_radius/plate_scale_ord[iord]
 
-            # TODO -- We probably shouldn't be operating on a SpecObjs but instead a SpecObj
-            flux_tmp  = moment1d(image*inmask_iord, sobjs_align[indx][0].TRACE_SPAT, 2*box_rad_pix,
-                                 row=sobjs_align[indx][0].trace_spec)[0]
-            var_tmp  = moment1d(varimg*inmask_iord, sobjs_align[indx][0].TRACE_SPAT, 2*box_rad_pix,
-                                row=sobjs_align[indx][0].trace_spec)[0]
-            ivar_tmp = utils.calc_ivar(var_tmp)
-            pixtot  = moment1d(ivar*0 + 1.0, sobjs_align[indx][0].TRACE_SPAT, 2*box_rad_pix,
-                               row=sobjs_align[indx][0].trace_spec)[0]
-            mask_tmp = moment1d(ivar*inmask_iord == 0.0, sobjs_align[indx][0].TRACE_SPAT, 2*box_rad_pix,
-                                row=sobjs_align[indx][0].trace_spec)[0] != pixtot
-
-            flux_box[:,iord,iobj] = flux_tmp*mask_tmp
-            ivar_box[:,iord,iobj] = np.fmax(ivar_tmp*mask_tmp,0.0)
-            mask_box[:,iord,iobj] = mask_tmp
-            mean, med_sn, stddev = astropy.stats.sigma_clipped_stats(
-                flux_box[mask_tmp,iord,iobj]*np.sqrt(ivar_box[mask_tmp,iord,iobj]),
-                sigma_lower=5.0,sigma_upper=5.0
-            )
+    # The masked images fed to moment1d change only through the per-order slit
+    # mask; precompute the invariant ivar good-pixel mask and reuse
+    # preallocated buffers for the products rather than allocating fresh
+    # full-image temporaries in every iteration.
+    ivar_gpm = ivar > 0.0
+    image_iord = np.empty_like(image)
+    var_iord = np.empty_like(varimg)
+    nspat = image.shape[1]
+    # Zero-padded integral image of the good-pixel mask along the spatial
+    # direction, rebuilt per order below; turns the boxcar "any good pixel in
+    # the window" test into two lookups per spectral pixel.
+    cum_good = np.zeros((nspec, nspat+1), dtype=int)
+
+    # Index every (order, object) pair once up front rather than scanning the
+    # SpecObjs arrays with slitorder_objid_indices norders*nobj times inside
+    # the loop
+    obj_id_to_iobj = {objid: iobj for iobj, objid in enumerate(uni_obj_id)}
+    idx_table = np.full((norders, nobj), -1, dtype=int)
+    for k, sobj in enumerate(sobjs_align):
+        idx_table[sobj.ECH_ORDERINDX, obj_id_to_iobj[sobj.ECH_OBJID]] = k
+    if np.any(idx_table < 0):
+        msgs.error('Echelle object finding failed to fill in all the orders. '
+                   'Report this bug to PypeIt developers')
+
+    # SNR.  All the objects on an order share the slit mask, boxcar radius and
+    # extraction rows, so the extractions are batched across objects with a
+    # single moment1d call per image per order using the stacked (nspec, nobj)
+    # traces, rather than making O(nobj*norders) separate calls.
+    for iord in range(norders):
+        # TODO -- We probably shouldn't be operating on a SpecObjs but instead a SpecObj
+        sobjs_ord = [sobjs_align[idx_table[iord, iobj]] for iobj in range(nobj)]
+        inmask_iord = inmask & (slitmask == sobjs_ord[0].SLITID)# gdslit_spat[iord])
+        # TODO make the snippet below its own function quick_extraction()
+        box_rad_pix = box_radius/plate_scale_ord[iord]
+        traces = np.stack([sobj.TRACE_SPAT for sobj in sobjs_ord], axis=1)
+        rows = sobjs_ord[0].trace_spec
+
+        np.multiply(image, inmask_iord, out=image_iord)
+        np.multiply(varimg, inmask_iord, out=var_iord)
+        flux_tmp  = moment1d(image_iord, traces, 2*box_rad_pix, row=rows)[0]
+        var_tmp  = moment1d(var_iord, traces, 2*box_rad_pix, row=rows)[0]
+        # A boxcar window contains good data if and only if any good pixel
+        # receives weight, i.e. any good pixel lies strictly within
+        # box_rad_pix + 0.5 of the trace.  Count those pixels from the
+        # integral image instead of running another boxcar extraction.
+        np.cumsum(ivar_gpm & inmask_iord, axis=1, out=cum_good[:,1:])
+        ilo = np.clip(np.floor(traces - box_rad_pix - 0.5).astype(int) + 1, 0, nspat)
+        ihi = np.clip(np.ceil(traces + box_rad_pix + 0.5).astype(int), 0, nspat)
+        mask_tmp = cum_good[rows[:,None], ihi] - cum_good[rows[:,None], ilo] > 0
+
+        flux_box[:,iord,:] = flux_tmp*mask_tmp
+        var_box[:,iord,:] = var_tmp
+        mask_box[:,iord,:] = mask_tmp
+        sobjs_arr[iord,:] = sobjs_ord
+
+    # Invert the whole variance cube in one elementwise pass instead of one
+    # calc_ivar call per order
+    ivar_box = np.fmax(utils.calc_ivar(var_box)*mask_box, 0.0)
+
+    # Sigma-clipped median S/N of every (order, object) pair in one clipping
+    # pass over the whole cube, rather than nobj*norders separate
+    # sigma_clipped_stats calls on short slices
+    mean, SNR_arr, stddev = astropy.stats.sigma_clipped_stats(
+        flux_box*np.sqrt(ivar_box), mask=np.logical_not(mask_box.astype(bool)),
+        sigma_lower=5.0, sigma_upper=5.0, axis=0
+    )
+    for iord in range(norders):
+        for iobj in range(nobj):
             # ToDO assign this to sobjs_align for use in the extraction
-            SNR_arr[iord,iobj] = med_sn
-            sobjs_align[indx][0].ech_snr = med_sn
+            sobjs_arr[iord,iobj].ech_snr = SNR_arr[iord,iobj]
             # For hand extractions
-            slitfracpos_arr[iord,iobj] = sobjs_align[indx][0].SPAT_FRACPOS
+            slitfracpos_arr[iord,iobj] = sobjs_arr[iord,iobj].SPAT_FRACPOS
 
     # Purge objects with low SNR that don't show up in enough orders, sort the list of objects with respect to obj_id
     # and orderindx
@@ -773,9 +918,30 @@ def ech_cutobj_on_snr(
     iobj_keep = 1
     iobj_keep_not_hand = 1
 
+    # Sort the aligned objects by (ECH_OBJID, SLITID) once; each kept object
+    # is then a contiguous, already-sorted slice below rather than a masked
+    # selection followed by a per-object argsort
+    align_sort = np.lexsort((sobjs_align.SLITID, sobjs_align.ECH_OBJID))
+    objid_sorted = sobjs_align.ECH_OBJID[align_sort]
+    obj_start = np.searchsorted(objid_sorted, uni_obj_id, side='left')
+    obj_end = np.searchsorted(objid_sorted, uni_obj_id, side='right')
+
     ## Loop over objects from highest SNR to lowest SNR. Apply the S/N constraints. Once we hit the maximum number
     # objects requested exit, except keep the hand apertures that were requested.
-    isort_SNR_max = np.argsort(np.median(SNR_arr,axis=0))[::-1]
+    # The scan must visit every object (hand apertures are kept past the
+    # nperorder cap and lower-ranked objects backfill slots when a higher one
+    # fails the S/N cut), but the full descending ranking can be built from
+    # two partial sorts around the cap via argpartition instead of one full
+    # argsort.
+    med_snr = np.median(SNR_arr, axis=0)
+    kpart = min(nperorder, nobj)
+    if 0 < kpart < nobj:
+        part = np.argpartition(-med_snr, kpart-1)
+        isort_SNR_max = np.concatenate(
+            [part[:kpart][np.argsort(-med_snr[part[:kpart]])],
+             part[kpart:][np.argsort(-med_snr[part[kpart:]])]])
+    else:
+        isort_SNR_max = np.argsort(med_snr)[::-1]
     for iobj in isort_SNR_max:
         hand_ap_flag = hand_flag[iobj]
         SNR_constraint = (SNR_arr[:,iobj].max() > max_snr) or (
@@ -783,11 +949,10 @@ def ech_cutobj_on_snr(
         nperorder_constraint = (iobj_keep-1) < nperorder
         if (SNR_constraint and nperorder_constraint) or hand_ap_flag:
             keep_obj[iobj] = True
-            ikeep = sobjs_align.ECH_OBJID == uni_obj_id[iobj]
-            sobjs_keep = sobjs_align[ikeep].copy()
+            sobjs_keep = sobjs_align[align_sort[obj_start[iobj]:obj_end[iobj]]].copy()
             sobjs_keep.ECH_OBJID = iobj_keep
             sobjs_keep.OBJID = iobj_keep
-            sobjs_trim.add_sobj(sobjs_keep[np.argsort(sobjs_keep.SLITID)])
+            sobjs_trim.add_sobj(sobjs_keep)
             iobj_keep += 1
             if not hand_ap_flag:
                 iobj_keep_not_hand += 1
@@ -907,19 +1072,21 @@ def ech_pca_traces(
     pca_fits = np.zeros((nspec, norders, nobj_trim))
 
     # Create the trc_inmask for iterative fitting below
-    trc_inmask = np.zeros((nspec, norders), dtype=bool)
-    for iord in range(norders):
-        trc_inmask[:,iord] = (
-            spec_vec >= spec_min_max[0,iord]) & (
-                spec_vec <= spec_min_max[1,iord])
+    trc_inmask = (spec_vec[:,None] >= spec_min_max[0][None,:]) \
+                    & (spec_vec[:,None] <= spec_min_max[1][None,:])
 
-    for iobj in range(nobj_trim):
+    # These masks do not depend on the object
+    inmask_now = inmask & allmask
+    bpm = np.invert(inmask_now)
+    trace_bpm = np.invert(trc_inmask)
+
+    def fit_obj_traces(iobj):
+        """PCA fit and iterative centroiding for a single object."""
         indx_obj_id = sobjs_final.ECH_OBJID == (iobj + 1)
         # PCA predict all the orders now (where we have used the standard or slit boundary for the bad orders above)
         msgs.info('Fitting echelle object finding PCA for object {:d}/{:d} with median SNR = {:5.3f}'.format(
             iobj + 1,nobj_trim,np.median(sobjs_final[indx_obj_id].ech_snr)))
-        pca_fits[:,:,iobj] \
-                = tracepca.pca_trace_object(
+        pca_fit = tracepca.pca_trace_object(
                     sobjs_final[indx_obj_id].TRACE_SPAT.T,
                     order=coeff_npoly, npca=npca,
                     pca_explained_var=pca_explained_var,
@@ -930,26 +1097,43 @@ def ech_pca_traces(
         # JXP -- Updated to now be S/N**2, i.e. inverse variance, with fitting fit
 
         # Perform iterative flux weighted centroiding using new PCA predictions
-        xinit_fweight = pca_fits[:,:,iobj].copy()
-        inmask_now = inmask & allmask
-        xfit_fweight = fit_trace(image, xinit_fweight, ncoeff, bpm=np.invert(inmask_now),
-                                 trace_bpm=np.invert(trc_inmask), fwhm=fwhm, maxdev=maxdev,
+        xinit_fweight = pca_fit.copy()
+        xfit_fweight = fit_trace(image, xinit_fweight, ncoeff, bpm=bpm,
+                                 trace_bpm=trace_bpm, fwhm=fwhm, maxdev=maxdev,
                                  debug=show_fits)[0]
 
         # Perform iterative Gaussian weighted centroiding
         xinit_gweight = xfit_fweight.copy()
-        xfit_gweight = fit_trace(image, xinit_gweight, ncoeff, bpm=np.invert(inmask_now),
-                                 trace_bpm=np.invert(trc_inmask), weighting='gaussian', fwhm=fwhm,
+        xfit_gweight = fit_trace(image, xinit_gweight, ncoeff, bpm=bpm,
+                                 trace_bpm=trace_bpm, weighting='gaussian', fwhm=fwhm,
                                  maxdev=maxdev, debug=show_fits)[0]
+        return pca_fit, xfit_gweight
+
+    # The per-object fits are independent and dominated by GIL-releasing
+    # NumPy/LAPACK work, so run them in a thread pool.  Keep the serial path
+    # when QA plots were requested, since the plotting is not thread safe.
+    if show_pca or show_fits or nobj_trim == 1:
+        results = [fit_obj_traces(iobj) for iobj in range(nobj_trim)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(nobj_trim, os.cpu_count() or 1)) as executor:
+            results = list(executor.map(fit_obj_traces, range(nobj_trim)))
 
+    for iobj in range(nobj_trim):
+        pca_fits[:,:,iobj], xfit_gweight = results[iobj]
+        indx_obj_id = sobjs_final.ECH_OBJID == (iobj + 1)
         #TODO  Assign the new traces. Only assign the orders that were not orginally detected and traced. If this works
         # well, we will avoid doing all of the iter_tracefits above to make the code faster.
-        for iord, spec in enumerate(sobjs_final[indx_obj_id]):
-            # JFH added the condition on ech_frac_was_fit with S/N cut on 7-7-19.
-            # TODO is this robust against half the order being masked?
-            if spec.ech_frac_was_fit and (spec.ech_snr > 1.0):
-                    spec.TRACE_SPAT = xfit_gweight[:,iord]
-                    spec.SPAT_PIXPOS = spec.TRACE_SPAT[specmid]
+        this_sobjs = sobjs_final[indx_obj_id]
+        # JFH added the condition on ech_frac_was_fit with S/N cut on 7-7-19.
+        # TODO is this robust against half the order being masked?
+        upd = this_sobjs.ech_frac_was_fit & (this_sobjs.ech_snr > 1.0)
+        if np.any(upd):
+            # Batch the writes through the SpecObjs elementwise setter (rows
+            # of a length-matched array pair up with the objects) rather than
+            # assigning attribute by attribute per object
+            this_upd = this_sobjs[upd]
+            this_upd.TRACE_SPAT = xfit_gweight[:,upd].T
+            this_upd.SPAT_PIXPOS = xfit_gweight[specmid,upd]
 
     #TODO Put in some criterion here that does not let the fractional position change too much during the iterative
     # tracefitting. The problem is spurious apertures identified on one slit can be pulled over to the center of flux
@@ -2064,85 +2248,89 @@ def get_fwhm(fwhm_in, nsamp, smash_peakflux, spat_fracpos, flux_smash_smth):
     collapsed flux profile by determining the locations along the spatial
     direction where this profile reaches have its peak value.
 
+    The measurement is vectorized over objects: passing arrays of peak fluxes
+    and fractional positions measures every object in one pass over the
+    profile.
+
     Args:
         fwhm_in (:obj:`float`):
            Best guess for the FWHM of this object.
         nsamp (:obj:`int`):
            Number of pixels along the spatial direction.
-        smash_peakflux (:obj:`float`):
+        smash_peakflux (:obj:`float`, `numpy.ndarray`_):
             The peak flux in the 1d (spectrally collapsed) flux profile at the
-            object location.
-        spat_fracpos (:obj:`float`):
+            object location, either for a single object or an array for a set
+            of objects.
+        spat_fracpos (:obj:`float`, `numpy.ndarray`_):
             Fractional spatial position along the slit where the object is
             located and at which the ``flux_smash_smth`` array has values
-            provided by ``smash_peakflux`` (see above and below).
+            provided by ``smash_peakflux`` (see above and below).  Must match
+            ``smash_peakflux`` in shape.
         flux_smash_smth (`numpy.ndarray`_):
             A 1D array with the flux averaged along the spectral direction at
             each location along the slit in the spatial direction location.
             Shape is ``(nsamp,)``.
 
     Returns:
-        :obj:`float`: The FWHM determined from the object flux profile, unless
-        the FWHM could not be found from the profile, in which case the input
-        guess (``fwhm_in``) is simply returned.
+        :obj:`float`, `numpy.ndarray`_: The FWHM determined from the object
+        flux profile, unless the FWHM could not be found from the profile, in
+        which case the input guess (``fwhm_in``) is simply returned.  An array
+        if the object inputs are arrays, a float otherwise.
     """
+    scalar = np.ndim(smash_peakflux) == 0
+    peakflux = np.atleast_1d(np.asarray(smash_peakflux, dtype=float))
+    fracpos = np.atleast_1d(np.asarray(spat_fracpos, dtype=float))
+    nsamp = int(nsamp)
+    rows = np.arange(nsamp)
 
     # Determine the fwhm max
-    yhalf = 0.5*smash_peakflux
-    xpk = spat_fracpos*nsamp
-    x0 = int(np.rint(xpk))
-    # TODO It seems we have two codes that do similar things, i.e. findfwhm in arextract.py. Could imagine having one
-    # Find right location where smash profile croses yhalf
-    if x0 < (int(nsamp) - 1):
-        ind_righ, = np.where(flux_smash_smth[x0:] < yhalf)
-        if len(ind_righ) > 0:
-            i2 = ind_righ[0]
-            if i2 == 0:
-                xrigh = None
-            else:
-                xarr_righ = x0 + np.array([i2 - 1, i2], dtype=float)
-                xrigh_int = scipy.interpolate.interp1d(flux_smash_smth[x0 + i2 - 1:x0 + i2 + 1], xarr_righ,
-                                                       assume_sorted=False, bounds_error=False,
-                                                       fill_value=(xarr_righ[0], xarr_righ[1]))
-                xrigh = xrigh_int([yhalf])[0]
-        else:
-            xrigh = None
-    else:
-        xrigh = None
-    # Find left location where smash profile crosses yhalf
-    if x0 > 0:
-        ind_left, = np.where(flux_smash_smth[0:np.fmin(x0 + 1, int(nsamp) - 1)] < yhalf)
-        if len(ind_left) > 0:
-            i1 = (ind_left[::-1])[0]
-            if i1 == (int(nsamp) - 1):
-                xleft = None
-            else:
-                xarr_left = np.array([i1, i1 + 1], dtype=float)
-                xleft_int = scipy.interpolate.interp1d(flux_smash_smth[i1:i1 + 2], xarr_left,
-                                                       assume_sorted=False, bounds_error=False,
-                                                       fill_value=(xarr_left[0], xarr_left[1]))
-                xleft = xleft_int([yhalf])[0]
-        else:
-            xleft = None
-    else:
-        xleft = None
-
-    # Set FWHM for the object
-    if (xleft is None) & (xrigh is None):
-        fwhm_measure = None
-    elif xrigh is None:
-        fwhm_measure = 2.0 * (xpk - xleft)
-    elif xleft is None:
-        fwhm_measure = 2.0 * (xrigh - xpk)
-    else:
-        fwhm_measure = (xrigh - xleft)
-
-    if fwhm_measure is not None:
-        fwhm_out = np.sqrt(np.fmax(fwhm_measure ** 2 - fwhm_in ** 2, (fwhm_in / 2.0) ** 2))  # Set a floor of fwhm/2 on fwhm
-    else:
-        fwhm_out = fwhm_in
+    yhalf = 0.5*peakflux
+    xpk = fracpos*nsamp
+    x0 = np.rint(xpk).astype(int)
+    # Profile samples below each object's half maximum, one column per object
+    below = flux_smash_smth[:,None] < yhalf[None,:]
 
-    return fwhm_out
+    # TODO It seems we have two codes that do similar things, i.e. findfwhm in arextract.py. Could imagine having one
+    # Find right location where smash profile croses yhalf: the first
+    # below-threshold sample at or beyond the peak
+    below_righ = below & (rows[:,None] >= x0[None,:])
+    i2 = np.argmax(below_righ, axis=0)
+    righ_ok = (x0 < nsamp - 1) & np.any(below_righ, axis=0) & (i2 > x0)
+    # Closed-form linear crossing between the two bracketing samples, clamped
+    # to the bracket when yhalf falls outside the sampled fluxes (indices are
+    # clipped only so the gather is safe on the columns masked by righ_ok)
+    ilo = np.clip(i2 - 1, 0, nsamp - 1)
+    f0 = flux_smash_smth[ilo]
+    f1 = flux_smash_smth[np.clip(i2, 0, nsamp - 1)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        xrigh = ilo + (yhalf - f0)/(f1 - f0)
+    xrigh = np.where(yhalf < np.fmin(f0, f1), ilo, xrigh)
+    xrigh = np.where(yhalf > np.fmax(f0, f1), ilo + 1, xrigh)
+
+    # Find left location where smash profile crosses yhalf: the last
+    # below-threshold sample before the peak
+    below_left = below & (rows[:,None] < np.fmin(x0 + 1, nsamp - 1)[None,:])
+    i1 = nsamp - 1 - np.argmax(below_left[::-1], axis=0)
+    left_ok = (x0 > 0) & np.any(below_left, axis=0) & (i1 != nsamp - 1)
+    i1 = np.clip(i1, 0, nsamp - 2)
+    g0 = flux_smash_smth[i1]
+    g1 = flux_smash_smth[i1 + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        xleft = i1 + (yhalf - g0)/(g1 - g0)
+    xleft = np.where(yhalf < np.fmin(g0, g1), i1, xleft)
+    xleft = np.where(yhalf > np.fmax(g0, g1), i1 + 1, xleft)
+
+    # Set FWHM for the object: both crossings if available, twice the
+    # one-sided width otherwise
+    fwhm_measure = np.where(left_ok & righ_ok, xrigh - xleft,
+                            np.where(righ_ok, 2.0*(xrigh - xpk),
+                                     np.where(left_ok, 2.0*(xpk - xleft), np.nan)))
+    # Set a floor of fwhm/2 on fwhm
+    fwhm_out = np.where(np.isfinite(fwhm_measure),
+                        np.sqrt(np.fmax(fwhm_measure**2 - fwhm_in**2, (fwhm_in/2.0)**2)),
+                        fwhm_in)
+
+    return float(fwhm_out[0]) if scalar else fwhm_out
 
 
 def objs_in_slit(image, ivar, thismask, slit_left, slit_righ, 
@@ -2374,13 +2562,27 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
     xsize = slit_righ - slit_left
     #nsamp = np.ceil(np.median(xsize)) # JFH Changed 07-07-19
     nsamp = np.ceil(xsize.max())
+    # Cast the (float) sample count to an integer once for the array shapes below
+    nsamp_i = int(nsamp)
     # Mask skypixels with 2 fwhm of edge
-    left_asym = slit_left[:,None] + np.outer(xsize/nsamp, np.arange(nsamp))
-    righ_asym = left_asym + np.outer(xsize/nsamp, np.ones(int(nsamp)))
+    left_asym = slit_left[:,None] + (xsize/nsamp)[:,None]*np.arange(nsamp)[None,:]
+    righ_asym = left_asym + (xsize/nsamp)[:,None]
     # This extract_asymbox_boxcar call rectifies the image along the curved object traces
     gpm_tot = thismask & inmask & (ivar > 0.0)
 
-    image_rect, gpm_rect, npix_rect, ivar_rect = extract.extract_asym_boxcar(image, left_asym, righ_asym, gpm=gpm_tot, ivar=ivar)
+    # Rectify in spectral panels so that the active rows of the image and the
+    # asymmetric trace arrays stay cache resident; the extraction is row-wise
+    # independent, so the panels tile the full-image result exactly.
+    nblock = 256
+    image_rect = np.empty((nspec, nsamp_i))
+    gpm_rect = np.empty((nspec, nsamp_i), dtype=bool)
+    npix_rect = np.empty((nspec, nsamp_i))
+    ivar_rect = np.empty((nspec, nsamp_i))
+    for s0 in range(0, nspec, nblock):
+        s1 = min(s0 + nblock, nspec)
+        image_rect[s0:s1], gpm_rect[s0:s1], npix_rect[s0:s1], ivar_rect[s0:s1] = \
+                extract.extract_asym_boxcar(image[s0:s1], left_asym[s0:s1], righ_asym[s0:s1],
+                                            gpm=gpm_tot[s0:s1], ivar=ivar[s0:s1])
 
     # This smashes out the spatial direction to construct an aggregate sky model
     #sky_mean, sky_median, sky_sig = stats.sigma_clipped_stats(image_rect, mask=np.logical_not(gpm_rect), axis=1, sigma=3.0,
@@ -2389,28 +2591,51 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
     #sky_fill_value = np.median(sky_median[gpm_sky]) if np.any(gpm_sky) else 0.0
     #sky_median[np.logical_not(gpm_sky)] = sky_fill_value
 
-    #sky_rect = np.repeat(sky_median[:, np.newaxis], nsamp, axis=1)
+    # If this sky model is ever revived, broadcast the sky vector
+    # (sky_median[:, None]) instead of materializing an (nspec, nsamp) repeat
+    #sky_rect = sky_median[:, np.newaxis]
     #sky_rect = 0.0*image_rect
 
 
-    # Apply find_min_max_out
-    find_min_max_gpm = np.zeros_like(image_rect, dtype=bool)
-    find_min_max_gpm[find_min_max_out[0]: find_min_max_out[1], :] = True
-    data = np.ma.MaskedArray(
-        image_rect, mask=np.logical_not(gpm_rect & find_min_max_gpm)) # the total gpm = gpm_rect & find_min_max_gpm
+    # Apply find_min_max_out: the bad-pixel mask for the clip is the inverted
+    # rectification mask with the rows outside the spectral search window
+    # flagged in place, rather than an intermediate window gpm and a second
+    # full-size combination.  SigmaClip below reduces along axis=0 up to
+    # maxiters times; F-ordered copies make every column a contiguous slice
+    # for the per-column median/MAD passes (and for the axis=0 smash sums
+    # downstream, which see the F-ordered clipped mask)
+    bpm_rect = np.asfortranarray(np.logical_not(gpm_rect))
+    bpm_rect[:find_min_max_out[0], :] = True
+    bpm_rect[find_min_max_out[1]:, :] = True
+    # Clip a NaN-filled float array instead of a MaskedArray: the nan-aware
+    # center/std functions see the same values, and the survivors come back
+    # as the finite entries, without MaskedArray bookkeeping on every
+    # reduction
+    data = np.asfortranarray(np.where(bpm_rect, np.nan, image_rect))
+    # maxiters only caps the clipping: SigmaClip stops iterating as soon as a
+    # pass rejects nothing, so well-behaved data converges in a few passes
     sigclip = astropy.stats.SigmaClip(
         sigma=sigclip_smash, maxiters=25, cenfunc='median', stdfunc=utils.nan_mad_std
     )
-    data_clipped, lower, upper = sigclip(data, axis=0, masked=True, return_bounds=True)
-    gpm_sigclip = np.logical_not(data_clipped.mask)
+    data_clipped, lower, upper = sigclip(data, axis=0, masked=False, return_bounds=True)
+    gpm_sigclip = np.isfinite(data_clipped)
 
 
-    # Compute the average flux over the set of pixels that are not masked by gpm_sigclip
+    # Compute the average flux over the set of pixels that are not masked by
+    # gpm_sigclip.  Slice the spectral search window once and reuse the views:
+    # masking after the slice touches only the rows that are actually summed,
+    # rather than building full-height masked temporaries and discarding the
+    # rows outside the window.
     nsmash = find_min_max_out[1] - find_min_max_out[0] + 1
-    npix_smash = np.sum(gpm_sigclip[find_min_max_out[0]:find_min_max_out[1]], axis=0)
+    gpm_sigclip_smash = gpm_sigclip[find_min_max_out[0]:find_min_max_out[1]]
+    npix_smash = np.sum(gpm_sigclip_smash, axis=0)
     gpm_smash = npix_smash > 0.3*nsmash
-    flux_sum_smash = np.sum((image_rect*gpm_sigclip)[find_min_max_out[0]:find_min_max_out[1]], axis=0)
-    flux_smash = flux_sum_smash*gpm_smash/(npix_smash + (npix_smash == 0.0))
+    flux_sum_smash = np.sum(image_rect[find_min_max_out[0]:find_min_max_out[1]]*gpm_sigclip_smash,
+                            axis=0)
+    # Branchless guarded division: columns with no unmasked pixels stay 0
+    # without materializing the (npix == 0) guard temporaries
+    flux_smash = np.divide(flux_sum_smash*gpm_smash, npix_smash,
+                           out=np.zeros_like(flux_sum_smash), where=npix_smash > 0)
     flux_smash_mean, flux_smash_med, flux_smash_std = astropy.stats.sigma_clipped_stats(
         flux_smash, mask=np.logical_not(gpm_smash), sigma_lower=3.0, sigma_upper=3.0
     )
@@ -2427,17 +2652,40 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
             msgs.info('No objects found automatically.')
             
     else:
-        # Compute the formal corresponding variance over the set of pixels that are not masked by gpm_sigclip
-        var_rect = utils.inverse(ivar_rect)
-        var_sum_smash = np.sum((var_rect*gpm_sigclip)[find_min_max_out[0]:find_min_max_out[1]], axis=0)
-        var_smash = var_sum_smash/(npix_smash**2 + (npix_smash == 0.0))
+        # Compute the formal corresponding variance over the set of pixels that
+        # are not masked by gpm_sigclip; the variance is only needed inside the
+        # search window, so only invert those rows
+        var_rect = utils.inverse(ivar_rect[find_min_max_out[0]:find_min_max_out[1]])
+        var_sum_smash = np.sum(var_rect*gpm_sigclip_smash, axis=0)
+        var_smash = np.divide(var_sum_smash, npix_smash**2,
+                              out=np.zeros_like(var_sum_smash), where=npix_smash > 0)
         ivar_smash = utils.inverse(var_smash)*gpm_smash
         snr_smash = flux_smash_recen*np.sqrt(ivar_smash)
 
         # Smooth this SNR image with a Gaussian set by the input fwhm
         gauss_smth_sigma = (fwhm/2.3548)
-        snr_smash_smth = scipy.ndimage.gaussian_filter1d(snr_smash, gauss_smth_sigma, mode='nearest')
-        flux_smash_smth = scipy.ndimage.gaussian_filter1d(flux_smash_recen, gauss_smth_sigma, mode='nearest')
+        # Both vectors are smoothed with the same kernel, so build the
+        # truncated Gaussian taps once (matching the scipy.ndimage default
+        # truncation at 4 sigma) and apply them directly, padding with the
+        # edge values to reproduce mode='nearest'.
+        gauss_smth_lw = int(4.0*gauss_smth_sigma + 0.5)
+        gauss_smth_kern = np.exp(-0.5*(np.arange(-gauss_smth_lw, gauss_smth_lw+1)/gauss_smth_sigma)**2)
+        gauss_smth_kern /= gauss_smth_kern.sum()
+        # Direct convolution is fastest for the short kernels typical of
+        # slit-width smoothing; switch to the FFT-based convolution when the
+        # work (signal length times taps) grows large, e.g. very wide slits
+        # with a large input fwhm.  The FFT path smooths both vectors in a
+        # single batched call so the kernel transform is computed once.
+        if nsamp_i*(2*gauss_smth_lw + 1) > 50000:
+            snr_smash_smth, flux_smash_smth = scipy.signal.fftconvolve(
+                np.pad(np.vstack([snr_smash, flux_smash_recen]),
+                       ((0, 0), (gauss_smth_lw, gauss_smth_lw)), mode='edge'),
+                gauss_smth_kern[None,:], mode='valid', axes=1)
+        else:
+            snr_smash_smth = np.convolve(np.pad(snr_smash, gauss_smth_lw, mode='edge'),
+                                         gauss_smth_kern, mode='valid')
+            flux_smash_smth = np.convolve(np.pad(flux_smash_recen, gauss_smth_lw, mode='edge'),
+                                          gauss_smth_kern, mode='valid')
         # Search for spatial direction peaks in the smoothed snr image
         _, _, x_peaks_out, x_width, x_err, igood, _, _ = arc.detect_lines(
             snr_smash_smth, input_thresh=snr_thresh, fit_frac_fwhm=1.5, fwhm=fwhm, min_pkdist_frac_fwhm=0.75,
@@ -2463,10 +2711,13 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
 
         # If the user requested the nperslit most significant peaks have been requested, then only return these
         if nperslit is not None:
-            # If the requested number is less than (the non-edge) number found, mask them out
+            # If the requested number is less than (the non-edge) number found, mask them out.
+            # The cut is the nperslit-th largest S/N among the non-edge peaks,
+            # selected with a linear-time partition instead of a full sort
             if nperslit < npeak_not_near_edge:
-                snr_peaks_not_edge = np.sort(snr_peaks_all[np.logical_not(near_edge_bpm)])[::-1]
-                snr_thresh_perslit = snr_peaks_not_edge[nperslit-1]
+                snr_peaks_not_edge = snr_peaks_all[np.logical_not(near_edge_bpm)]
+                snr_thresh_perslit = np.partition(
+                    snr_peaks_not_edge, npeak_not_near_edge - nperslit)[npeak_not_near_edge - nperslit]
                 nperslit_bpm = np.logical_not(near_edge_bpm) & (snr_peaks_all < snr_thresh_perslit)
             else:
                 nperslit_bpm = np.zeros(npeaks_all, dtype=bool)
@@ -2488,7 +2739,12 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
         # TODO: Change this to show_image or something
         if show_peaks:
             # Show rectified image here? Add this to QA
-            viewer, ch = display.show_image(image_rect*gpm_rect*np.sqrt(ivar_rect), chname='objs_in_slit_show', cuts=(-5.0,5.0))
+            # Build the displayed product in a single buffer rather than
+            # through chained full-image temporaries
+            image_show = np.sqrt(ivar_rect)
+            image_show *= image_rect
+            image_show *= gpm_rect
+            viewer, ch = display.show_image(image_show, chname='objs_in_slit_show', cuts=(-5.0,5.0))
         # QA
         objfind_QA(spat_peaks, snr_peaks_all, spat_vector, snr_smash_smth, snr_thresh, qa_title, peaks_gpm,
                 near_edge_bpm, nperslit_bpm, objfindQA_filename=objfindQA_filename, show=show_peaks) #show_peaks)
@@ -2510,32 +2766,33 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
             thisobj.smash_snr = snr_peaks[iobj]
             sobjs.add_sobj(thisobj)
 
-        for iobj in range(nobj_reg):
+        # Build all the preliminary traces with one broadcast over the peak
+        # fractions; the loop below then only does per-object attribute writes
+        if nobj_reg > 0:
+            frac_peaks = x_peaks/nsamp
+            # ToDO make this the average left and right boundary instead. That would be more robust.
+            trace_mat = slit_left[:,None] + xsize[:,None]*frac_peaks[None,:]
             # Was a standard trace provided? If so, use that as a crutch.
             if std_trace is not None:
-                # Print a status message for the first object
-                if iobj == 0:
-                    msgs.info('Using input STANDARD star trace as crutch for object tracing')
-
+                msgs.info('Using input STANDARD star trace as crutch for object tracing')
                 x_trace = np.interp(specmid, spec_vec, std_trace)
-                shift = np.interp(specmid, spec_vec,
-                slit_left + xsize * sobjs[iobj].SPAT_FRACPOS) - x_trace
-                sobjs[iobj].TRACE_SPAT = std_trace + shift
-                # If no standard trace is provided shift left slit boundary over to be initial trace
-            else:
-                # ToDO make this the average left and right boundary instead. That would be more robust.
-                sobjs[iobj].TRACE_SPAT = slit_left + xsize*sobjs[iobj].SPAT_FRACPOS
+                # Shift the standard star trace over to each object position
+                shift = trace_mat[specmid,:] - x_trace
+                trace_mat = std_trace[:,None] + shift[None,:]
+            # Measure the FWHM of every object in a single vectorized pass
+            # over the smashed profile
+            fwhm_peaks = np.full(nobj_reg, fwhm) if use_user_fwhm \
+                else get_fwhm(fwhm, nsamp, flux_peaks, frac_peaks, flux_smash_smth)
 
+        for iobj in range(nobj_reg):
+            sobjs[iobj].TRACE_SPAT = trace_mat[:,iobj]
             sobjs[iobj].trace_spec = spec_vec
-            sobjs[iobj].SPAT_PIXPOS = sobjs[iobj].TRACE_SPAT[specmid]
+            sobjs[iobj].SPAT_PIXPOS = trace_mat[specmid,iobj]
             # Set the idx for any prelminary outputs we print out. These will be updated shortly
             sobjs[iobj].set_name()
 
             # assign FWHM to all these objects
-            if use_user_fwhm:
-                sobjs[iobj].FWHM = fwhm
-            else:
-                sobjs[iobj].FWHM = get_fwhm(fwhm, nsamp, sobjs[iobj].smash_peakflux, sobjs[iobj].SPAT_FRACPOS, flux_smash_smth)
+            sobjs[iobj].FWHM = fwhm_peaks[iobj]
 
             # assign BOX_RADIUS
             sobjs[iobj].BOX_RADIUS = boxcar_rad
@@ -2555,13 +2812,19 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
         # Note the transpose is here to pass in the TRACE_SPAT correctly.
         xinit_fweight = np.copy(sobjs.TRACE_SPAT.T)
         spec_mask = (spec_vec >= spec_min_max_out[0]) & (spec_vec <= spec_min_max_out[1])
-        trc_inmask = np.outer(spec_mask, np.ones(len(sobjs), dtype=bool))
-        xfit_fweight = fit_trace(image, xinit_fweight, ncoeff, bpm=np.invert(inmask), maxshift=1.,
-                                 trace_bpm=np.invert(trc_inmask), fwhm=fwhm, maxdev=maxdev,
+        # Invert the masks once; both fit_trace calls use the same bad-pixel
+        # masks, and fit_trace only reads trace_bpm so a zero-copy broadcast
+        # view replaces the (nspec, nobj) outer product
+        bpm = np.invert(inmask)
+        trc_bpm = np.broadcast_to(np.invert(spec_mask)[:,None], (nspec, len(sobjs)))
+        xfit_fweight = fit_trace(image, xinit_fweight, ncoeff, bpm=bpm, maxshift=1.,
+                                 trace_bpm=trc_bpm, fwhm=fwhm, maxdev=maxdev,
                                  idx=sobjs.NAME, debug=show_fits)[0]
+        # The gaussian-weighted pass is seeded by the flux-weighted result, so
+        # the two fits are inherently sequential; they share the hoisted masks
         xinit_gweight = np.copy(xfit_fweight)
-        xfit_gweight = fit_trace(image, xinit_gweight, ncoeff, bpm=np.invert(inmask), maxshift=1.,
-                                 trace_bpm=np.invert(trc_inmask), fwhm=fwhm, maxdev=maxdev,
+        xfit_gweight = fit_trace(image, xinit_gweight, ncoeff, bpm=bpm, maxshift=1.,
+                                 trace_bpm=trc_bpm, fwhm=fwhm, maxdev=maxdev,
                                  weighting='gaussian', idx=sobjs.NAME, debug=show_fits)[0]
 
         # assign the final trace
@@ -2591,16 +2854,28 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
 
         # Decide how to assign a trace to the hand objects
         if nobj_reg > 0:  # Use brightest object on slit?
-            smash_peakflux = sobjs.smash_peakflux
-            ibri = smash_peakflux.argmax()
+            # The peak-flux and FWHM arrays from the detection step are still
+            # in object order here, so use them directly rather than
+            # aggregating the attributes back off the SpecObjs
+            ibri = int(np.argmax(flux_peaks))
             trace_model = sobjs[ibri].TRACE_SPAT
-            med_fwhm_reg = np.median(sobjs.FWHM)
+            med_fwhm_reg = np.median(fwhm_peaks)
         elif std_trace is not None:   # If no objects found, use the standard?
             trace_model = std_trace
         else:  # If no objects or standard use the slit boundary
             msgs.warn("No source to use as a trace.  Using the slit boundary")
             trace_model = slit_left
 
+        # The interpolants are loop invariant: build the ximg spline once and
+        # evaluate every hand position in one vectorized call, rather than
+        # reconstructing the spline per aperture
+        if nobj_hand > 0:
+            f_ximg = scipy.interpolate.RectBivariateSpline(spec_vec, spat_vec, ximg)
+            hand_fracpos = f_ximg(hand_extract_spec, hand_extract_spat, grid=False) # interpolate from ximg
+            hand_peakflux = np.interp(hand_fracpos*nsamp, np.arange(nsamp), flux_smash_smth) # interpolate from fluxconv
+            hand_snr = np.interp(hand_fracpos*nsamp, np.arange(nsamp), snr_smash_smth) # interpolate from the smashed S/N
+            hand_spat_0 = np.interp(hand_extract_spec, spec_vec, trace_model)
+
         # Loop over hand_extract apertures and create and assign specobj
         for iobj in range(nobj_hand):
             # Proceed
@@ -2611,13 +2886,11 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
             thisobj.hand_extract_fwhm = hand_extract_fwhm[iobj]
             thisobj.hand_extract_flag = True
             # SPAT_FRACPOS
-            f_ximg = scipy.interpolate.RectBivariateSpline(spec_vec, spat_vec, ximg)
-            thisobj.SPAT_FRACPOS = float(f_ximg(thisobj.hand_extract_spec, thisobj.hand_extract_spat, grid=False)) # interpolate from ximg
-            thisobj.smash_peakflux = np.interp(thisobj.SPAT_FRACPOS*nsamp,np.arange(nsamp), flux_smash_smth) # interpolate from fluxconv
-            thisobj.smash_snr = np.interp(thisobj.SPAT_FRACPOS*nsamp,np.arange(nsamp), snr_smash_smth) # interpolate from fluxconv
+            thisobj.SPAT_FRACPOS = float(hand_fracpos[iobj])
+            thisobj.smash_peakflux = hand_peakflux[iobj]
+            thisobj.smash_snr = hand_snr[iobj]
             # assign the trace
-            spat_0 = np.interp(thisobj.hand_extract_spec, spec_vec, trace_model)
-            shift = thisobj.hand_extract_spat - spat_0
+            shift = thisobj.hand_extract_spat - hand_spat_0[iobj]
             thisobj.TRACE_SPAT = trace_model + shift
             thisobj.trace_spec = spec_vec
             thisobj.SPAT_PIXPOS = thisobj.TRACE_SPAT[specmid]
@@ -2641,8 +2914,9 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
     nobj = len(sobjs)
 
     ## Okay now loop over all the regular aps and exclude any which within the fwhm of the hand_extract_APERTURES
+    spat_pixpos = sobjs.SPAT_PIXPOS if nobj > 0 else np.zeros(0)
+    keep = np.ones(nobj, dtype=bool)
     if nobj_reg > 0 and hand_extract_dict is not None:
-        spat_pixpos = sobjs.SPAT_PIXPOS
         hand_flag = sobjs.hand_extract_flag
         spec_fwhm = sobjs.FWHM
         #spat_pixpos = np.array([spec.SPAT_PIXPOS for spec in specobjs])
@@ -2652,36 +2926,42 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
         hand_ind, = np.where(hand_flag)
         #med_fwhm = np.median(spec_fwhm[~hand_flag])
         #spat_pixpos_hand = spat_pixpos[hand_ind]
-        keep = np.ones(nobj, dtype=bool)
-        for ihand in hand_ind:
-            close = np.abs(sobjs[reg_ind].SPAT_PIXPOS - spat_pixpos[ihand]) <= 0.6*spec_fwhm[ihand]
-            if np.any(close):
-                # Print out a warning
-                msgs.warn('Deleting object(s) {}'.format(sobjs[reg_ind[close]].NAME) +
-                          ' because it collides with a user specified hand_extract aperture')
-                keep[reg_ind[close]] = False
-
-        sobjs = sobjs[keep]
-
-
-    if len(sobjs) == 0:
+        # One broadcast comparison of every regular object against every hand
+        # aperture replaces the per-aperture distance scans
+        close = np.abs(spat_pixpos[reg_ind][:,None] - spat_pixpos[hand_ind][None,:]) \
+                    <= 0.6*spec_fwhm[hand_ind][None,:]
+        collide = np.any(close, axis=1)
+        if np.any(collide):
+            # Print out a warning
+            msgs.warn('Deleting object(s) {}'.format(sobjs[reg_ind[collide]].NAME) +
+                      ' because it collides with a user specified hand_extract aperture')
+            keep[reg_ind[collide]] = False
+
+    if not np.any(keep):
         msgs.info('No hand or normal objects found on this slit. Returning')
         return specobjs.SpecObjs()
 
-    # Sort objects according to their spatial location
-    nobj = len(sobjs)
-    spat_pixpos = sobjs.SPAT_PIXPOS
-    sobjs = sobjs[spat_pixpos.argsort()]
+    # Sort the surviving objects according to their spatial location, folding
+    # the collision filter and the sort into one container rebuild instead of
+    # indexing the SpecObjs twice
+    order = np.flatnonzero(keep)[np.argsort(spat_pixpos[keep])]
+    nobj = order.size
+    sobjs = sobjs[order]
     # Assign integer objids
     sobjs.OBJID = np.arange(nobj) + 1
 
-    # Assign the maskwidth
-    for iobj in range(nobj):
-        sobjs[iobj].maskwidth = extract_maskwidth*sobjs[iobj].FWHM*(1.0 + 0.5*np.log10(np.fmax(sobjs[iobj].smash_snr,1.0)))
+    # Assign the maskwidth, fetching the attribute arrays once and writing
+    # back through the elementwise setter
+    sobjs.maskwidth = extract_maskwidth*sobjs.FWHM \
+            * (1.0 + 0.5*np.log10(np.fmax(sobjs.smash_snr, 1.0)))
 
     # If requested display the resulting traces on top of the image
     if show_trace:
-        viewer, ch = display.show_image(image*(thismask*inmask))
+        # Mask the image in place in a single buffer rather than through a
+        # chained mask temporary
+        image_show = image*thismask
+        image_show *= inmask
+        viewer, ch = display.show_image(image_show)
         display.show_slits(viewer, ch, slit_left.T, slit_righ.T, slit_ids = sobjs[0].SLITID)
         for iobj in range(nobj):
             if sobjs[iobj].hand_extract_flag == False:
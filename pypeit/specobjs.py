@@ -512,9 +512,7 @@ class SpecObjs:
             self.specobjs = np.append(self.specobjs, [sobj])
             return
         if isinstance(sobj, SpecObjs):
-            # TODO: Possible to instead do np.append(self.specobjs, sobj.specobjs)?
-            for isobj in sobj:
-                self.specobjs = np.append(self.specobjs, isobj)
+            self.specobjs = np.append(self.specobjs, sobj.specobjs)
             return
         if not isinstance(sobj, (np.ndarray, list)):
             msgs.error(f'Unable to add {type(sobj)} objects to SpecObjs')